@@ -2,8 +2,12 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, font as tkfont
 from pathlib import Path
 import shutil
-from collections import defaultdict
+import errno
+from collections import Counter, deque
 import threading
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, ALL_COMPLETED
 import json
 import os
 import sys
@@ -11,6 +15,14 @@ from datetime import datetime
 import locale  # para nombre de mes en español
 import base64
 from io import BytesIO
+from functools import cached_property
+
+# PIL es opcional (solo para reescalar el logo): se importa una vez, no en cada ventana
+try:
+    from PIL import Image, ImageTk
+    _HAS_PIL = True
+except Exception:
+    _HAS_PIL = False
 
 # =========================
 #  Utilidades de recursos
@@ -40,7 +52,8 @@ LOGO_B64 = ""  # Fallback sin archivo
 
 APP_DIR = Path(os.getenv('APPDATA', Path.home())) / "OrganizadorArchivos"
 CONFIG_PATH = APP_DIR / "config.json"
-LAST_RUN_PATH = APP_DIR / "last_run.json"  # para deshacer
+LAST_RUN_PATH = APP_DIR / "last_run.jsonl"  # para deshacer (una movida por línea)
+LAST_RUN_LEGACY_PATH = APP_DIR / "last_run.json"  # formato anterior: una lista JSON
 
 def load_config():
     if CONFIG_PATH.exists():
@@ -54,179 +67,526 @@ def save_config(cfg: dict):
     APP_DIR.mkdir(parents=True, exist_ok=True)
     CONFIG_PATH.write_text(json.dumps(cfg, ensure_ascii=False, indent=2), encoding="utf-8")
 
-def save_last_run(movidas):
-    """movidas: lista de tuplas (dst, src) donde dst es nuevo y src el original."""
+def open_last_run():
+    """Abre (vacío) el registro para deshacer de una ejecución nueva; None si no se puede."""
     try:
         APP_DIR.mkdir(parents=True, exist_ok=True)
-        data = [{"dst": d, "src": s} for d, s in movidas]
-        LAST_RUN_PATH.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        # Con búfer por líneas cada movida queda en disco al momento: si la app se cierra
+        # a medias, lo ya movido se puede deshacer igualmente
+        return LAST_RUN_PATH.open("w", encoding="utf-8", buffering=1)
+    except Exception:
+        return None
+
+def append_last_run(f, dst: str, src: str):
+    """Añade una movida al registro abierto: dst es el nuevo y src el original."""
+    try:
+        f.write(json.dumps({"dst": dst, "src": src}, ensure_ascii=False) + "\n")
     except Exception:
         pass
 
 def load_last_run():
+    plan = []
     if LAST_RUN_PATH.exists():
         try:
-            return json.loads(LAST_RUN_PATH.read_text(encoding="utf-8"))
+            with LAST_RUN_PATH.open(encoding="utf-8") as f:
+                for linea in f:
+                    try:
+                        plan.append(json.loads(linea))
+                    except ValueError:
+                        pass  # línea a medias si la ejecución se cortó
         except Exception:
             return []
-    return []
+    return plan
 
-def clear_last_run():
+def migrate_last_run():
+    """Convierte a JSONL el last_run.json de versiones anteriores (una vez, al arrancar)."""
+    if not LAST_RUN_LEGACY_PATH.exists():
+        return
     try:
-        if LAST_RUN_PATH.exists():
-            LAST_RUN_PATH.unlink()
+        if not LAST_RUN_PATH.exists():
+            plan = []
+            try:
+                plan = json.loads(LAST_RUN_LEGACY_PATH.read_text(encoding="utf-8"))
+            except ValueError:
+                pass  # ilegible: no hay nada que recuperar, solo se borra
+            if plan:
+                f = open_last_run()
+                if f is None:
+                    return  # se reintenta en el próximo arranque
+                with f:
+                    for par in plan:
+                        append_last_run(f, par["dst"], par["src"])
+        LAST_RUN_LEGACY_PATH.unlink()
     except Exception:
         pass
 
+def clear_last_run():
+    for path in (LAST_RUN_PATH, LAST_RUN_LEGACY_PATH):
+        try:
+            if path.exists():
+                path.unlink()
+        except Exception:
+            pass
+
 # =========================
 #  Config: carpetas y extensiones
 # =========================
+# Nombres de categoría internados: una sola instancia de cada uno en todo el programa
+CAT_IMAGENES = sys.intern("Imágenes")
+CAT_PDFS = sys.intern("PDFs")
+CAT_VIDEOS = sys.intern("Vídeos")
+CAT_WORD = sys.intern("Documentos Word")
+CAT_EXCEL = sys.intern("Excel")
+CAT_TEXTO = sys.intern("Texto")
+
 DESTINOS = {
-    "Imágenes": {".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp", ".tiff", ".svg", ".heic"},
-    "PDFs": {".pdf"},
-    "Vídeos": {".mp4", ".mov", ".avi", ".mkv", ".webm", ".wmv"},
-    "Documentos Word": {".doc", ".docx", ".odt"},
-    "Excel": {".xls", ".xlsx", ".xlsm", ".xlsb", ".xltx", ".ods", ".csv"},
-    "Texto": {".txt", ".md", ".rtf"},
+    CAT_IMAGENES: frozenset({".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp", ".tiff", ".svg", ".heic"}),
+    CAT_PDFS: frozenset({".pdf"}),
+    CAT_VIDEOS: frozenset({".mp4", ".mov", ".avi", ".mkv", ".webm", ".wmv"}),
+    CAT_WORD: frozenset({".doc", ".docx", ".odt"}),
+    CAT_EXCEL: frozenset({".xls", ".xlsx", ".xlsm", ".xlsb", ".xltx", ".ods", ".csv"}),
+    CAT_TEXTO: frozenset({".txt", ".md", ".rtf"}),
 }
-CARPETA_OTROS = "Otros"
-EXT_A_CARPETA = {ext: carpeta for carpeta, exts in DESTINOS.items() for ext in exts}
+CARPETA_OTROS = sys.intern("Otros")
+CATEGORIAS = list(DESTINOS.keys()) + [CARPETA_OTROS]
+# Índice fijo por categoría: los contadores son una lista en vez de un dict
+CATEGORY_IDS = {nombre: i for i, nombre in enumerate(CATEGORIAS)}
+# Carpetas de primer nivel que ya son destino: el recorrido no entra en ellas
+_DEST_TOP_NAMES = frozenset(CATEGORIAS)
+# Claves internadas: búsquedas por la vía rápida de dict con cadenas cortas
+EXT_A_CARPETA = {sys.intern(ext): carpeta for carpeta, exts in DESTINOS.items() for ext in exts}
 
 # Subcarpetas por fecha para ciertas categorías (lista de carpetas con fecha)
 DATE_SUBFOLDERS = {
-    "Excel": "%Y/%m",
-    "Documentos Word": "%Y/%m",
-    "Texto": "%Y/%m",
+    CAT_EXCEL: "%Y/%m",
+    CAT_WORD: "%Y/%m",
+    CAT_TEXTO: "%Y/%m",
 }
+_DATE_CATEGORIES = frozenset(DATE_SUBFOLDERS)
+# Extensiones que necesitan la fecha de modificación: solo a esas se les hace stat()
+EXT_CON_FECHA = frozenset(ext for ext, carpeta in EXT_A_CARPETA.items() if carpeta in _DATE_CATEGORIES)
 
 # =========================
 #  Helpers de fecha/idioma
 # =========================
-def mes_nombre_es(dt: datetime) -> str:
-    # Intenta varias locales comunes en Windows/Linux
+# Fallback manual si no hay locale española
+_MESES_ES = [
+    "Enero","Febrero","Marzo","Abril","Mayo","Junio",
+    "Julio","Agosto","Septiembre","Octubre","Noviembre","Diciembre"
+]
+
+def _activar_locale_es() -> bool:
+    # Intenta varias locales comunes en Windows/Linux. Se hace una sola vez al importar:
+    # setlocale es global al proceso y caro, no queremos repetirlo por archivo.
     for loc in ("es_ES.UTF-8", "es_ES", "Spanish_Spain.1252", "Spanish_Spain"):
         try:
             locale.setlocale(locale.LC_TIME, loc)
-            nombre = dt.strftime("%B")
-            if nombre:
-                return nombre.capitalize()
+            if datetime(2000, 1, 1).strftime("%B"):
+                return True
         except Exception:
             pass
-    # Fallback manual si no hay locale española
-    nombres = [
-        "Enero","Febrero","Marzo","Abril","Mayo","Junio",
-        "Julio","Agosto","Septiembre","Octubre","Noviembre","Diciembre"
-    ]
-    return nombres[dt.month - 1]
+    return False
+
+if _activar_locale_es():
+    def mes_nombre_es(dt: datetime) -> str:
+        return dt.strftime("%B").capitalize()
+else:
+    def mes_nombre_es(dt: datetime) -> str:
+        return _MESES_ES[dt.month - 1]
 
 # =========================
 #  Utilidades de archivo
 # =========================
-def ruta_unica(dest: Path) -> Path:
-    if not dest.exists():
+def extension(nombre: str) -> str:
+    """Como Path.suffix.lower(), sin crear un Path (las extensiones configuradas son ASCII)."""
+    i = nombre.rfind(".")
+    return nombre[i:].lower() if i > 0 else ""
+
+def _primer_hueco(ocupado) -> int:
+    """Devuelve un n ≥ 1 con ocupado(n) falso para nombrar "nombre (n).ext".
+
+    Sondeo exponencial (1, 2, 4, 8…) hasta dar con un hueco y bisección en el último
+    tramo: O(log n) comprobaciones aunque ya existan cientos de "nombre (n).ext".
+    """
+    hi = 1
+    while ocupado(hi):
+        hi *= 2
+    lo = hi // 2  # ocupado (0 = el propio nombre)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if ocupado(mid):
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
+def ruta_unica(dest: str) -> str:
+    # lexists: un enlace simbólico roto también ocupa el nombre (O_EXCL fallaría con él)
+    if not os.path.lexists(dest):
         return dest
-    i = 1
-    while True:
-        candidato = dest.with_name(f"{dest.stem} ({i}){dest.suffix}")
-        if not candidato.exists():
-            return candidato
-        i += 1
-
-def _esta_dentro_de_destino(base: Path, p: Path) -> bool:
+    raiz, ext = os.path.splitext(dest)
+    n = _primer_hueco(lambda i: os.path.lexists(f"{raiz} ({i}){ext}"))
+    return f"{raiz} ({n}){ext}"
+
+def reservar_nombre(destino_dir: str, nombre: str, ocupados: dict) -> str:
+    """Elige en memoria un nombre libre en destino_dir, sin syscalls por colisión.
+
+    ocupados: destino_dir → nombres (normcase) ya presentes o asignados en esta ejecución;
+    cada carpeta se lee una sola vez con os.listdir la primera vez que aparece.
+    """
+    existentes = ocupados.get(destino_dir)
+    if existentes is None:
+        try:
+            existentes = {os.path.normcase(n) for n in os.listdir(destino_dir)}
+        except OSError:
+            existentes = set()
+        ocupados[destino_dir] = existentes
+    libre = nombre
+    if os.path.normcase(libre) in existentes:
+        raiz, ext = os.path.splitext(nombre)
+        n = _primer_hueco(lambda i: os.path.normcase(f"{raiz} ({i}){ext}") in existentes)
+        libre = f"{raiz} ({n}){ext}"
+    existentes.add(os.path.normcase(libre))
+    return os.path.join(destino_dir, libre)
+
+MAX_INTENTOS_RESERVA = 100
+
+def reservar_ruta(dest: str) -> str:
+    """Reclama dest (o un "dest (n)" libre) creando un archivo vacío con O_CREAT|O_EXCL."""
+    candidato = dest
+    for _ in range(MAX_INTENTOS_RESERVA):
+        try:
+            fd = os.open(candidato, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            # Ocupado por otro proceso desde que se eligió el nombre: buscar otro en disco
+            candidato = ruta_unica(dest)
+            continue
+        os.close(fd)
+        return candidato
+    raise FileExistsError(errno.EEXIST, "No se encontró un nombre libre", dest)
+
+if sys.platform == "win32":
     try:
-        rel = p.relative_to(base)
+        import ctypes
+        _MoveFileExW = ctypes.WinDLL("kernel32", use_last_error=True).MoveFileExW
+        _MoveFileExW.argtypes = (ctypes.c_wchar_p, ctypes.c_wchar_p, ctypes.c_uint32)
+        _MoveFileExW.restype = ctypes.c_int
     except Exception:
-        return False
-    if not rel.parts:
-        return False
-    primer_nivel = rel.parts[0]
-    destinos = set(DESTINOS.keys()) | {CARPETA_OTROS}
-    return primer_nivel in destinos
-
-def listar_archivos(base: Path, recursivo: bool):
-    it = base.rglob("*") if recursivo else base.iterdir()
-    for p in it:
-        if not p.is_file():
-            continue
-        # Ignorar temporales de Office
-        if p.name.startswith("~$"):
-            continue
-        if _esta_dentro_de_destino(base, p):
+        _MoveFileExW = None
+else:
+    _MoveFileExW = None
+MOVEFILE_REPLACE_EXISTING = 0x1
+MOVEFILE_COPY_ALLOWED = 0x2
+
+_ERRNOS_SIN_COPY_FILE_RANGE = {errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL}
+
+def _copy_file_range(src: str, dst: str) -> bool:
+    """Copia dentro del kernel; en btrfs/xfs puede compartir bloques (reflink) sin copiar datos.
+
+    Devuelve False si el kernel no copia nada en la primera llamada (hay que usar otra vía).
+    """
+    with open(src, "rb") as f_src, open(dst, "wb") as f_dst:
+        tamano = restante = os.fstat(f_src.fileno()).st_size
+        while restante > 0:
+            n = os.copy_file_range(f_src.fileno(), f_dst.fileno(), restante)
+            if n == 0:
+                if restante == tamano:
+                    return False  # como shutil: 0 de entrada = copia rápida no soportada
+                raise OSError(errno.EIO, "Copia incompleta: fin de archivo inesperado", src)
+            restante -= n
+    return True
+
+def _mover_entre_unidades(src: str, dst: str):
+    # Que copie el kernel: los bytes no pasan por el proceso de Python
+    if _MoveFileExW is not None:
+        if not _MoveFileExW(src, dst, MOVEFILE_COPY_ALLOWED | MOVEFILE_REPLACE_EXISTING):
+            raise ctypes.WinError(ctypes.get_last_error())
+    elif sys.platform.startswith("linux"):
+        try:
+            copiado = _copy_file_range(src, dst)
+        except (OSError, AttributeError) as ex:
+            # Kernel < 5.3 (EXDEV), sistema de archivos sin soporte, o Python sin la función
+            if isinstance(ex, OSError) and ex.errno not in _ERRNOS_SIN_COPY_FILE_RANGE:
+                raise
+            copiado = False
+        if not copiado:
+            shutil.copyfile(src, dst)  # usa os.sendfile en Linux
+        # El origen solo se borra si la copia está completa; si no, mover_sin_colision
+        # elimina el destino a medias y el original se queda donde estaba
+        if os.path.getsize(dst) != os.path.getsize(src):
+            raise OSError(errno.EIO, "Copia incompleta", dst)
+        shutil.copystat(src, dst)  # conservar la fecha de modificación
+        os.unlink(src)
+    else:
+        shutil.move(src, dst)
+
+def fast_move(src: str, dst: str):
+    """Mueve con os.replace (misma unidad) y solo copia cuando el origen está en otra unidad."""
+    try:
+        os.replace(src, dst)
+    except OSError as ex:
+        if ex.errno != errno.EXDEV:
+            raise
+        _mover_entre_unidades(src, dst)
+
+def mover_sin_colision(src: str, dest: str) -> str:
+    """Mueve src a dest (o a "dest (n)" si ya existe) sin carreras; devuelve la ruta final."""
+    final = reservar_ruta(dest)
+    try:
+        fast_move(src, final)
+    except BaseException:
+        # No dejar el archivo vacío de la reserva
+        try:
+            os.remove(final)
+        except OSError:
+            pass
+        raise
+    return final
+
+def listar_archivos(base: Path, recursivo: bool, con_fecha: bool = True):
+    """Recorre `base` con os.scandir y devuelve tuplas (ruta, nombre, ext, mtime).
+
+    DirEntry ya trae el tipo (y en Windows el stat) de readdir/FindNextFile,
+    así que no hace falta un stat() extra por entrada. mtime solo se lee para las
+    extensiones que van a subcarpetas por fecha (si con_fecha); para el resto es None.
+    """
+    pila = [(str(base), True)]
+    while pila:
+        actual, es_base = pila.pop()
+        try:
+            it = os.scandir(actual)
+        except OSError:
             continue
-        yield p
-
-def _directorio_destino(base: Path, p: Path, carpeta: str) -> Path:
-    dest = base / carpeta
-    if carpeta in DATE_SUBFOLDERS:
-        # Usamos la fecha de modificación del archivo → Año / NombreMes, no la de creación.
-        dt = datetime.fromtimestamp(p.stat().st_mtime)
-        dest = dest / dt.strftime("%Y") / mes_nombre_es(dt)
+        with it:
+            for entry in it:
+                # Primero is_file: la mayoría de entradas son archivos y así basta una comprobación
+                if not entry.is_file(follow_symlinks=False):
+                    # Lo que ya está en las carpetas destino no se toca
+                    if (recursivo and entry.is_dir(follow_symlinks=False)
+                            and not (es_base and entry.name in _DEST_TOP_NAMES)):
+                        pila.append((entry.path, False))
+                    continue
+                nombre = entry.name
+                # Ignorar temporales de Office
+                if nombre.startswith("~$"):
+                    continue
+                ext = extension(nombre)
+                mtime = entry.stat().st_mtime if con_fecha and ext in EXT_CON_FECHA else None
+                yield entry.path, nombre, ext, mtime
+
+def _directorio_destino(base: str, carpeta: str, mtime, cache: dict) -> str:
+    """cache: carpeta o (carpeta, año, mes) → ruta, para no repetir joins/strftime por archivo.
+
+    mtime solo viene para las categorías con subcarpetas por fecha (None en el resto),
+    así que la mayoría de archivos no llega a construir ningún datetime.
+    """
+    if mtime is None:
+        dest = cache.get(carpeta)
+        if dest is None:
+            dest = cache[carpeta] = os.path.join(base, carpeta)
+        return dest
+    # Usamos la fecha de modificación del archivo → Año / NombreMes, no la de creación.
+    dt = datetime.fromtimestamp(mtime)
+    clave = (carpeta, dt.year, dt.month)
+    dest = cache.get(clave)
+    if dest is None:
+        dest = cache[clave] = os.path.join(base, carpeta, dt.strftime("%Y"), mes_nombre_es(dt))
     return dest
 
+def _producir_archivos(base: Path, recursivo: bool, cola: queue.Queue, parar: threading.Event,
+                       escaneo: list, escaneado: threading.Event):
+    """Hilo productor: recorre `base` y encola (ruta, nombre, carpeta, mtime); None al terminar.
+
+    Al acabar el recorrido deja el número de archivos en escaneo[0] y activa `escaneado`,
+    para que el consumidor conozca el total sin esperar a vaciar la cola.
+    """
+    def poner(item):
+        # put con timeout para no quedarse colgado si el consumidor ha abortado
+        while not parar.is_set():
+            try:
+                cola.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    get = EXT_A_CARPETA.get  # clasificar = una búsqueda en dict, sin resolver atributos por archivo
+    n = 0
+    try:
+        for ruta_archivo, nombre, ext, mtime in listar_archivos(base, recursivo):
+            if parar.is_set():
+                return
+            poner((ruta_archivo, nombre, get(ext, CARPETA_OTROS), mtime))
+            n += 1
+    except Exception as ex:
+        poner(ex)
+    else:
+        escaneo[0] = n
+        escaneado.set()
+    poner(None)
+
 # =========================
 #  Núcleo: organizar y analizar
 # =========================
-def organizar(ruta: Path, recursivo: bool, dry_run: bool, on_log, on_progress):
+# Hilos para mover: es E/S, así que compensa tener más que núcleos (configurable en "move_threads")
+MOVE_THREADS_DEFAULT = min(8, (os.cpu_count() or 1) * 2)
+# Como mucho un aviso de progreso cada tanto: la barra no redibuja más rápido
+PROGRESO_INTERVALO = 0.05  # segundos
+
+def organizar(ruta: Path, recursivo: bool, dry_run: bool, on_log, on_progress, on_move=None,
+              hilos=None):
+    """on_move(dst, src) se llama tras cada movida real (p. ej. para el registro de deshacer);
+    si se pasa, las movidas no se acumulan en memoria y pares_movidos vuelve vacío.
+
+    hilos: movimientos en paralelo (por defecto MOVE_THREADS_DEFAULT).
+
+    on_progress(hechos, total) recibe total=None mientras aún se están buscando archivos;
+    se llama como mucho cada PROGRESO_INTERVALO segundos, y siempre una última vez al acabar.
+    """
     ruta = ruta.expanduser().resolve()
     if not ruta.is_dir():
         raise ValueError(f"Ruta no válida: {ruta}")
 
-    for carpeta in list(DESTINOS.keys()) + [CARPETA_OTROS]:
-        (ruta / carpeta).mkdir(exist_ok=True)
-
-    archivos = list(listar_archivos(ruta, recursivo))
-    total = len(archivos)
+    if not dry_run:
+        for carpeta in _DEST_TOP_NAMES:
+            (ruta / carpeta).mkdir(exist_ok=True)
+
+    # El recorrido va en streaming: un productor llena una cola acotada mientras aquí se
+    # mueve, así la memoria no crece con el número de archivos y el primer movimiento no
+    # espera a que termine el escaneo.
+    cola = queue.Queue(maxsize=1024)
+    parar = threading.Event()
+    escaneo = [None]
+    escaneado = threading.Event()
+    threading.Thread(target=_producir_archivos, args=(ruta, recursivo, cola, parar, escaneo, escaneado),
+                     daemon=True).start()
+
+    total = None  # desconocido hasta que el productor termina el recorrido
+    hechos = 0
     on_progress(0, total)
 
-    movidos = defaultdict(int)
+    conteo = [0] * len(CATEGORY_IDS)
     errores = 0
-    pares_movidos = []  # [(dst, src)]
-
-    for i, p in enumerate(archivos, start=1):
-        ext = p.suffix.casefold()
-        carpeta = EXT_A_CARPETA.get(ext, CARPETA_OTROS)
-
-        destino_dir = _directorio_destino(ruta, p, carpeta)
-        destino_dir.mkdir(parents=True, exist_ok=True)
-
-        destino = ruta_unica(destino_dir / p.name)
-
-        try:
-            subruta_rel = destino_dir.relative_to(ruta).as_posix() + "/"
-        except Exception:
-            subruta_rel = f"{carpeta}/"
-
-        try:
-            on_log(f"{p.name}  →  {subruta_rel}")
+    pares_movidos = []  # [(dst, src)], solo sin on_move
+
+    # En el bucle trabajamos con str/os.path: Path crea objetos nuevos en cada operación
+    base = str(ruta)
+    directorios = {}      # (carpeta, año, mes) → ruta destino
+    creados = set()       # directorios ya creados: un makedirs por directorio, no por archivo
+    ocupados = {}         # directorio → nombres ya usados (ver reservar_nombre)
+    relativas = {}        # directorio → "Carpeta/Año/Mes/" para el log
+    # Los destinos salen de os.path.join(base, ...): basta con quitar el prefijo (sin relpath)
+    prefijo = base if base.endswith(os.sep) else base + os.sep
+
+    ultimo_aviso = time.monotonic()
+
+    # Mover es trabajo de E/S (rename suelta el GIL), así que va en un pool de hilos;
+    # los callbacks se llaman siempre desde este hilo.
+    def registrar(paso, destino, error):
+        nonlocal errores, hechos, ultimo_aviso, total
+        origen, nombre, carpeta, subruta_rel = paso
+        on_log(f"{nombre}  →  {subruta_rel}")
+        if error is None:
             if not dry_run:
-                shutil.move(str(p), str(destino))
                 # Para deshacer: (nuevo, original)
-                pares_movidos.append((str(destino), str(p)))
-            movidos[carpeta] += 1
-        except Exception as ex:
+                if on_move:
+                    on_move(destino, origen)
+                else:
+                    pares_movidos.append((destino, origen))
+            conteo[CATEGORY_IDS[carpeta]] += 1
+        else:
             errores += 1
-            on_log(f"   ⚠️ Error moviendo '{p.name}': {ex}")
-
-        on_progress(i, total)
+            on_log(f"   ⚠️ Error moviendo '{nombre}': {error}")
+        hechos += 1
+        ahora = time.monotonic()
+        if total is None and escaneado.is_set():
+            # Recorrido terminado: avisar ya para que la barra pase a modo determinado
+            total = escaneo[0]
+            ultimo_aviso = ahora
+            on_progress(hechos, total)
+        elif ahora - ultimo_aviso >= PROGRESO_INTERVALO:
+            ultimo_aviso = ahora
+            on_progress(hechos, total)
 
+    try:
+        hilos = max(1, int(hilos))
+    except (TypeError, ValueError):
+        hilos = MOVE_THREADS_DEFAULT
+    en_vuelo = {}  # futuro → paso; acotado para no acumular la lista entera
+
+    def recoger(return_when):
+        listos, _ = wait(en_vuelo, return_when=return_when)
+        for fut in listos:
+            paso = en_vuelo.pop(fut)
+            error = fut.exception()
+            registrar(paso, None if error else fut.result(), error)
+
+    recibidos = 0
+    try:
+        with ThreadPoolExecutor(max_workers=hilos) as pool:
+            try:
+                while True:
+                    item = cola.get()
+                    if item is None:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    recibidos += 1
+                    ruta_archivo, nombre, carpeta, mtime = item
+
+                    destino_dir = _directorio_destino(base, carpeta, mtime, directorios)
+                    # En simulación no se crea nada
+                    if not dry_run and destino_dir not in creados:
+                        os.makedirs(destino_dir, exist_ok=True)
+                        creados.add(destino_dir)
+
+                    subruta_rel = relativas.get(destino_dir)
+                    if subruta_rel is None:
+                        subruta_rel = relativas[destino_dir] = (
+                            destino_dir[len(prefijo):].replace(os.sep, "/") + "/")
+
+                    paso = (ruta_archivo, nombre, carpeta, subruta_rel)
+                    if dry_run:
+                        registrar(paso, None, None)
+                        continue
+                    # El nombre se elige aquí en memoria; el hilo lo reclama en disco con O_EXCL
+                    destino = reservar_nombre(destino_dir, nombre, ocupados)
+                    fut = pool.submit(mover_sin_colision, ruta_archivo, destino)
+                    en_vuelo[fut] = paso
+                    if len(en_vuelo) >= 2 * hilos:
+                        recoger(FIRST_COMPLETED)
+            except BaseException:
+                # Lo que ya está en vuelo se mueve igualmente: registrarlo para poder deshacerlo
+                parar.set()
+                if en_vuelo:
+                    recoger(ALL_COMPLETED)
+                raise
+
+            total = recibidos
+            if en_vuelo:
+                recoger(ALL_COMPLETED)
+    finally:
+        parar.set()
+
+    on_progress(hechos, total)
+    movidos = {nombre: n for nombre, n in zip(CATEGORIAS, conteo) if n}
     return movidos, errores, pares_movidos
 
 def analizar(ruta: Path, recursivo: bool):
     ruta = ruta.expanduser().resolve()
     if not ruta.is_dir():
         raise ValueError(f"Ruta no válida: {ruta}")
-    counts = defaultdict(int)
-    total = 0
-    for p in listar_archivos(ruta, recursivo):
-        ext = p.suffix.casefold()
-        carpeta = EXT_A_CARPETA.get(ext, CARPETA_OTROS)
-        counts[carpeta] += 1
-        total += 1
-    return dict(sorted(counts.items())), total
+    # Counter cuenta en C (_count_elements) en vez de un += por archivo en Python
+    get = EXT_A_CARPETA.get
+    counts = Counter(get(ext, CARPETA_OTROS)
+                     for _, _, ext, _ in listar_archivos(ruta, recursivo, con_fecha=False))
+    return dict(sorted(counts.items())), sum(counts.values())
 
 # =========================
 #  GUI
 # =========================
+MAX_LINEAS_LOG = 10000
+MAX_ITEMS_POR_TICK = 2000  # mensajes del hilo de trabajo procesados por vuelta de la cola
+
 class OrganizadorGUI:
     def __init__(self, root: tk.Tk):
         self.root = root
@@ -241,7 +601,20 @@ class OrganizadorGUI:
         # Cargar config
         self.config = load_config()
 
+        # Canal hilo de trabajo → UI: se vacía en lotes cada 50 ms en vez de un after() por archivo
+        self._ui_queue = queue.SimpleQueue()
+
+        # ¿Hay algo que deshacer? Se mantiene al día en vez de releer el registro en cada refresco
+        migrate_last_run()
+        self._has_last_run = LAST_RUN_PATH.exists()
+        # Mientras organiza, el registro se está escribiendo: no se puede deshacer a la vez
+        self._en_curso = False
+
+        # Logos ya decodificados por (origen, tamaño): Ayuda/Acerca de no repiten el reescalado
+        self._logos = {}
+
         self._build_ui()
+        self._drain_queue()
         self._apply_prefs()
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
@@ -253,7 +626,7 @@ class OrganizadorGUI:
         # Menú superior
         menubar = tk.Menu(self.root)
 
-        m_archivo = tk.Menu(menubar, tearoff=0)
+        m_archivo = self.m_archivo = tk.Menu(menubar, tearoff=0)
         m_archivo.add_command(label="Organizar\tF5", command=self._run)
         m_archivo.add_command(label="Analizar\tCtrl+E", command=self._analizar)
         m_archivo.add_separator()
@@ -335,12 +708,60 @@ class OrganizadorGUI:
             self.path_var.set(d)
 
     def _log(self, msg: str):
+        # msg puede ser un lote de líneas: un solo insert/see por lote
         self.txt_log.configure(state="normal")
         self.txt_log.insert("end", msg + "\n")
+        # Acotar el log: un Text sin límite crece sin fin en ejecuciones enormes
+        self.txt_log.delete("1.0", f"end - {MAX_LINEAS_LOG} lines")
         self.txt_log.see("end")
         self.txt_log.configure(state="disabled")
 
-    def _set_progress(self, curr: int, total: int):
+    def _en_ui(self, fn, *args):
+        """Programa fn(*args) en el hilo de Tk, respetando el orden de logs/progreso encolados."""
+        self._ui_queue.put(("call", fn, args))
+
+    def _drain_queue(self):
+        lineas, progreso = [], None
+
+        def volcar():
+            if lineas:
+                self._log("\n".join(lineas))
+                lineas.clear()
+            if progreso:
+                self._set_progress(*progreso)
+
+        pendiente = False
+        try:
+            for _ in range(MAX_ITEMS_POR_TICK):
+                item = self._ui_queue.get_nowait()
+                if item[0] == "log":
+                    lineas.append(item[1])
+                elif item[0] == "progress":
+                    progreso = item[1:]
+                else:
+                    volcar()
+                    progreso = None
+                    item[1](*item[2])
+            else:
+                pendiente = True
+        except queue.Empty:
+            pass
+        volcar()
+        # Si quedó trabajo, volver enseguida pero dejando antes que Tk atienda eventos
+        self.root.after(1 if pendiente else 50, self._drain_queue)
+
+    def _set_progress(self, curr: int, total):
+        if total is None:
+            # Aún buscando archivos: no se sabe el total, barra en modo indeterminado.
+            # organizar pasa el total en cuanto acaba el recorrido (no al final de la ejecución)
+            if str(self.progress["mode"]) != "indeterminate":
+                self.progress.configure(mode="indeterminate")
+                self.progress.start(15)
+            self.lbl_status.configure(text=f"Procesado {curr} (buscando archivos…)")
+            return
+        if str(self.progress["mode"]) != "determinate":
+            self.progress.stop()
+            self.progress.configure(mode="determinate")
         self.progress["maximum"] = max(1, total)
         self.progress["value"] = curr
         if total == 0:
@@ -350,6 +771,8 @@ class OrganizadorGUI:
 
     # ---------- Acciones ----------
     def _run(self):
+        if self._en_curso:
+            return  # F5 sigue activo aunque el botón esté deshabilitado
         ruta = Path(self.path_var.get())
         rec = self.recursive_var.get()
         dry = self.dry_run_var.get()
@@ -364,37 +787,55 @@ class OrganizadorGUI:
         self.txt_log.configure(state="disabled")
         self._set_progress(0, 1)
         self.btn_run.configure(state="disabled")
+        self._en_curso = True
+        self._toggle_undo_button()
         self.lbl_status.configure(text="Trabajando…")
 
         # Lanzar en hilo para no congelar la ventana
         def worker():
+            # El registro para deshacer se escribe según se mueve y se abre con la primera
+            # movida: si no se mueve nada, se conserva el de la ejecución anterior.
+            registro, abierto = None, False
+
+            def on_move(dst, src):
+                nonlocal registro, abierto
+                if not abierto:
+                    registro, abierto = open_last_run(), True
+                    if registro is not None:
+                        self._has_last_run = True
+                if registro is not None:
+                    append_last_run(registro, dst, src)
+
             try:
-                movidos, errores, pares_movidos = organizar(
-                    ruta, rec, dry,
-                    on_log=lambda m: self.root.after(0, self._log, m),
-                    on_progress=lambda c, t: self.root.after(0, self._set_progress, c, t),
-                )
-                if not dry and pares_movidos:
-                    # para deshacer movemos en sentido inverso (nuevo -> original)
-                    save_last_run(pares_movidos)
+                try:
+                    movidos, errores, _ = organizar(
+                        ruta, rec, dry,
+                        on_log=lambda m: self._ui_queue.put(("log", m)),
+                        on_progress=lambda c, t: self._ui_queue.put(("progress", c, t)),
+                        on_move=on_move,
+                        hilos=self.config.get("move_threads"),
+                    )
+                finally:
+                    if registro is not None:
+                        registro.close()
 
                 resumen = "\nResumen:\n" + "\n".join(f"  {k}: {v}" for k, v in sorted(movidos.items()))
                 if errores:
                     resumen += f"\n  Errores: {errores}"
-                self.root.after(0, self._log, resumen)
-                self.root.after(0, self.lbl_status.configure, {"text": "Completado."})
-                self.root.after(0, self.btn_run.configure, {"state": "normal"})
-                self.root.after(0, self._toggle_undo_button)
+                self._en_ui(self._log, resumen)
+                self._en_ui(self.lbl_status.configure, {"text": "Completado."})
+                self._en_ui(self._terminar_ejecucion)
 
                 if not sum(movidos.values()):
-                    self.root.after(0, messagebox.showinfo, "Organizador", "No había nada que mover.")
+                    self._en_ui(messagebox.showinfo, "Organizador", "No había nada que mover.")
                 else:
                     modo = "Simulación" if dry else "Hecho"
-                    self.root.after(0, messagebox.showinfo, "Organizador", f"{modo}.\n{resumen}")
+                    self._en_ui(messagebox.showinfo, "Organizador", f"{modo}.\n{resumen}")
             except Exception as ex:
-                self.root.after(0, self.btn_run.configure, {"state": "normal"})
-                self.root.after(0, self.lbl_status.configure, {"text": "Error"})
-                self.root.after(0, messagebox.showerror, "Error", str(ex))
+                self._en_ui(self._set_progress, 0, 0)  # para la animación si falló explorando
+                self._en_ui(self._terminar_ejecucion)
+                self._en_ui(self.lbl_status.configure, {"text": "Error"})
+                self._en_ui(messagebox.showerror, "Error", str(ex))
 
         threading.Thread(target=worker, daemon=True).start()
 
@@ -410,31 +851,50 @@ class OrganizadorGUI:
             messagebox.showerror("Análisis", str(ex))
 
     # ---------- Deshacer ----------
+    def _terminar_ejecucion(self):
+        # Fin de la escritura del registro: el flag se alinea con el archivo (un stat por
+        # ejecución), por si no se pudo abrir y sigue o no el de la ejecución anterior
+        self._has_last_run = LAST_RUN_PATH.exists()
+        self._en_curso = False
+        self.btn_run.configure(state="normal")
+        self._toggle_undo_button()
+
     def _toggle_undo_button(self):
-        has_last = bool(load_last_run())
-        self.btn_undo.configure(state="normal" if has_last else "disabled")
+        estado = "normal" if self._has_last_run and not self._en_curso else "disabled"
+        self.btn_undo.configure(state=estado)
+        self.m_archivo.entryconfigure("Deshacer último", state=estado)
 
     def _undo_last(self):
+        if self._en_curso:
+            return  # el registro es el de la ejecución en marcha, aún a medias
         plan = load_last_run()
         if not plan:
             messagebox.showinfo("Deshacer", "No hay operaciones para deshacer.")
+            self._has_last_run = False
             self._toggle_undo_button()
             return
 
         errores = 0
+        # El deshacer corre en el hilo de Tk: se vuelca al log de una vez (solo lo que cabe)
+        lineas = deque(maxlen=MAX_LINEAS_LOG)
+        creados = set()  # carpetas de origen ya recreadas: un mkdir por carpeta, no por archivo
         for par in plan:
             dst = Path(par["dst"])  # archivo actualmente en destino
             src = Path(par["src"])  # ruta original
             try:
-                src.parent.mkdir(parents=True, exist_ok=True)
-                final = ruta_unica(src)
-                shutil.move(str(dst), str(final))
-                self._log(f"Deshecho: {dst.name} → {final}")
+                if src.parent not in creados:
+                    src.parent.mkdir(parents=True, exist_ok=True)
+                    creados.add(src.parent)
+                final = mover_sin_colision(str(dst), str(src))
+                lineas.append(f"Deshecho: {dst.name} → {final}")
             except Exception as ex:
                 errores += 1
-                self._log(f"   ⚠️ Error deshaciendo '{dst.name}': {ex}")
+                lineas.append(f"   ⚠️ Error deshaciendo '{dst.name}': {ex}")
 
+        if lineas:
+            self._log("\n".join(lineas))
         clear_last_run()
+        self._has_last_run = False
         self._toggle_undo_button()
         if errores:
             messagebox.showwarning("Deshacer", f"Terminado con {errores} errores.")
@@ -445,34 +905,64 @@ class OrganizadorGUI:
     #  Imágenes (helpers)
     # ==========
     def _load_logo_from_file(self, path: Path, size=(40, 40)):
-        """Carga logo desde archivo; intenta PIL para reescalar y cae a tk.PhotoImage si falta PIL."""
-        try:
-            from PIL import Image, ImageTk
-            im = Image.open(path).convert("RGBA").resize(size, Image.LANCZOS)
-            return ImageTk.PhotoImage(im)
-        except Exception:
+        """Carga logo desde archivo; usa PIL para reescalar y cae a tk.PhotoImage si falta PIL."""
+        clave = (str(path), size)
+        if clave in self._logos:
+            return self._logos[clave]
+        logo = None
+        if _HAS_PIL:
+            try:
+                im = Image.open(path).convert("RGBA").resize(size, Image.LANCZOS)
+                logo = ImageTk.PhotoImage(im)
+            except Exception:
+                pass
+        if logo is None:
             try:
                 # Fallback sin reescalar
-                return tk.PhotoImage(file=str(path))
+                logo = tk.PhotoImage(file=str(path))
             except Exception:
-                return None
+                pass
+        self._logos[clave] = logo
+        return logo
 
     def _load_logo_embedded(self, b64_str: str, size=(40, 40)):
         if not b64_str:
             return None
+        clave = ("<embebido>", size)
+        if clave in self._logos:
+            return self._logos[clave]
+        logo = None
         # Intento con PIL
-        try:
-            from PIL import Image, ImageTk
-            data = base64.b64decode(b64_str)
-            im = Image.open(BytesIO(data)).convert("RGBA")
-            if size:
-                im = im.resize(size, Image.LANCZOS)
-            return ImageTk.PhotoImage(im)
-        except Exception:
+        if _HAS_PIL:
             try:
-                return tk.PhotoImage(data=b64_str)
+                data = base64.b64decode(b64_str)
+                im = Image.open(BytesIO(data)).convert("RGBA")
+                if size:
+                    im = im.resize(size, Image.LANCZOS)
+                logo = ImageTk.PhotoImage(im)
             except Exception:
-                return None
+                pass
+        if logo is None:
+            try:
+                logo = tk.PhotoImage(data=b64_str)
+            except Exception:
+                pass
+        self._logos[clave] = logo
+        return logo
+
+    @cached_property
+    def _logo_path(self):
+        """Ruta del logo, resuelta una sola vez (None si no está)."""
+        path = resource_path("images", "FileNest.png")
+        return path if path.exists() else None
+
+    def _logo(self, embedded_size):
+        # Ayuda y Acerca de comparten el mismo PhotoImage de 150×150
+        if self._logo_path is not None:
+            return self._load_logo_from_file(self._logo_path, (150, 150))
+        if LOGO_B64:
+            return self._load_logo_embedded(LOGO_B64, embedded_size)
+        return None
 
     # helpers de centrado
     def _center_child(self, win: tk.Toplevel):
@@ -507,12 +997,7 @@ class OrganizadorGUI:
         content.columnconfigure(0, weight=0)
         content.columnconfigure(1, weight=1)
 
-        logo_path = resource_path("images", "FileNest.png")
-        self.logo_help = None
-        if logo_path.exists():
-            self.logo_help = self._load_logo_from_file(logo_path, (150, 150))
-        elif LOGO_B64:
-            self.logo_help = self._load_logo_embedded(LOGO_B64, (64, 64))
+        self.logo_help = self._logo(embedded_size=(64, 64))
         if self.logo_help:
             ttk.Label(content, image=self.logo_help).grid(row=0, column=0, padx=(0, 14), pady=(0, 6), sticky="n")
 
@@ -553,13 +1038,7 @@ class OrganizadorGUI:
 
         url = "https://ko-fi.com/alvarogr87"
 
-        logo_path = resource_path("images", "FileNest.png")
-
-        self.logo_about = None
-        if logo_path.exists():
-            self.logo_about = self._load_logo_from_file(logo_path, (150, 150))
-        elif LOGO_B64:
-            self.logo_about = self._load_logo_embedded(LOGO_B64, (40, 40))
+        self.logo_about = self._logo(embedded_size=(40, 40))
 
         # Ventana modal
         win = tk.Toplevel(self.root)